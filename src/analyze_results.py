@@ -5,32 +5,68 @@ Analyzes the converted Excel data and generates insights
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
 import numpy as np
 from datetime import datetime
+import html
 import warnings
 warnings.filterwarnings('ignore')
 
+# Workbook written by pdf_converter.py's convert-all option
+DEFAULT_EXCEL_FILE = Path(__file__).resolve().parent.parent / "data" / "output" / "extracted_pdf_data.xlsx"
+
+# Larger datasets are downsampled before drawing the completeness heatmap
+MAX_HEATMAP_ROWS = 500
+
 class DataAnalyzer:
-    def __init__(self, excel_file="extracted_pdf_data.xlsx"):
+    def __init__(self, excel_file=DEFAULT_EXCEL_FILE):
         self.excel_file = excel_file
         self.data = None
-        self.setup_style()
+        self._found_mask = None
+        self._found_mask_source = None
+        self._style_ready = False
+        
+        # Custom color palette
+        self.colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD']
     
     def setup_style(self):
         """Setup matplotlib style for professional plots"""
+        # Plotting libraries are imported on first use to keep startup light
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
+        if self._style_ready:
+            return
         plt.style.use('default')
         sns.set_palette("husl")
+        self._style_ready = True
         
-        # Custom color palette
-        self.colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD']
+    def _show_and_close(self, fig):
+        """Display the figure on interactive backends, then free its buffers"""
+        import matplotlib
+        import matplotlib.pyplot as plt
         
+        if matplotlib.get_backend().lower() != 'agg':
+            plt.show()
+        plt.close(fig)
+    
+    @property
+    def _found(self):
+        """Cells that hold extracted values, shared by every analysis step"""
+        # Rebuilt only when self.data is replaced, not rescanned per column
+        if self._found_mask_source is not self.data:
+            self._found_mask = self.data.ne('Not Found')
+            self._found_mask_source = self.data
+        return self._found_mask
+    
     def load_data(self):
         """Load data from Excel file"""
         try:
-            self.data = pd.read_excel(self.excel_file)
+            try:
+                # Rust-backed reader, much faster than openpyxl's XML parsing
+                self.data = pd.read_excel(self.excel_file, engine='calamine')
+            except (ImportError, ValueError):
+                self.data = pd.read_excel(self.excel_file)
             print(f"✅ Loaded data: {len(self.data)} records, {len(self.data.columns)} columns")
             return True
         except FileNotFoundError:
@@ -49,26 +85,14 @@ class DataAnalyzer:
         print("="*50)
         
         # Calculate extraction success rates
-        quality_data = {}
         total_records = len(self.data)
-        
-        for column in self.data.columns:
-            if column not in ['source_file', 'processed_date']:
-                found_count = len(self.data[self.data[column] != 'Not Found'])
-                success_rate = (found_count / total_records) * 100
-                quality_data[column] = {
-                    'found': found_count,
-                    'total': total_records,
-                    'success_rate': success_rate
-                }
+        found = self._found.drop(columns=['source_file', 'processed_date'], errors='ignore').sum(axis=0)
         
         # Create quality DataFrame
-        quality_df = pd.DataFrame({
-            'Field': list(quality_data.keys()),
-            'Success_Rate': [data['success_rate'] for data in quality_data.values()],
-            'Found': [data['found'] for data in quality_data.values()],
-            'Total': [data['total'] for data in quality_data.values()]
-        })
+        quality_df = found.rename('Found').rename_axis('Field').reset_index()
+        quality_df['Total'] = total_records
+        quality_df['Success_Rate'] = quality_df['Found'] / total_records * 100
+        quality_df = quality_df[['Field', 'Success_Rate', 'Found', 'Total']]
         
         # Sort by success rate
         quality_df = quality_df.sort_values('Success_Rate', ascending=False)
@@ -82,6 +106,10 @@ class DataAnalyzer:
     
     def create_quality_visualization(self, quality_df):
         """Create extraction quality visualization"""
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
+        self.setup_style()
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
         fig.suptitle('PDF Data Extraction Quality Analysis', fontsize=16, fontweight='bold')
         
@@ -130,18 +158,20 @@ class DataAnalyzer:
         
         # 4. Data Completeness Heatmap
         # Create a sample heatmap showing data presence
-        heatmap_data = []
-        for _, row in self.data.iterrows():
-            record_completeness = []
-            for field in quality_df['Field']:
-                record_completeness.append(1 if row[field] != 'Not Found' else 0)
-            heatmap_data.append(record_completeness)
-        
-        heatmap_df = pd.DataFrame(heatmap_data, 
-                                 columns=[field.replace('_', ' ').title() for field in quality_df['Field']])
+        fields = quality_df['Field'].tolist()
+        sample = self._found
+        heatmap_title = 'Data Completeness by Record'
+        if len(self.data) > MAX_HEATMAP_ROWS:
+            sample_idx = np.linspace(0, len(self.data) - 1, MAX_HEATMAP_ROWS, dtype=int)
+            sample = self._found.iloc[sample_idx]
+            heatmap_title += f' (sampled {MAX_HEATMAP_ROWS} of {len(self.data)})'
+        
+        # The mask is already boolean, so the renderer gets 1 byte per cell
+        heatmap_df = sample[fields]
+        heatmap_df.columns = [field.replace('_', ' ').title() for field in fields]
         
         sns.heatmap(heatmap_df, ax=ax4, cmap='RdYlGn', cbar_kws={'label': 'Data Present'})
-        ax4.set_title('Data Completeness by Record', fontweight='bold')
+        ax4.set_title(heatmap_title, fontweight='bold')
         ax4.set_xlabel('Fields')
         ax4.set_ylabel('PDF Records')
         
@@ -149,8 +179,8 @@ class DataAnalyzer:
         
         # Save plot
         Path('screenshots').mkdir(exist_ok=True)
-        plt.savefig('screenshots/extraction_quality_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig('screenshots/extraction_quality_analysis.png', dpi=150, bbox_inches='tight')
+        self._show_and_close(fig)
         
         print("✅ Quality visualization saved to screenshots/extraction_quality_analysis.png")
     
@@ -163,55 +193,40 @@ class DataAnalyzer:
         
         # Position analysis (if job applications)
         if 'position' in self.data.columns:
-            positions = self.data[self.data['position'] != 'Not Found']['position'].value_counts()
+            positions = self.data['position'][self._found['position']].value_counts()
             if not positions.empty:
                 insights.append(f"Most common position applied for: {positions.index[0]} ({positions.iloc[0]} applications)")
         
         # Experience analysis
         if 'experience' in self.data.columns:
-            exp_data = self.data[self.data['experience'] != 'Not Found']['experience']
+            exp_data = self.data['experience'][self._found['experience']]
             if not exp_data.empty:
-                # Extract numeric years from experience strings
-                numeric_exp = []
-                for exp in exp_data:
-                    try:
-                        # Extract numbers from strings like "5 years"
-                        numbers = [int(s) for s in exp.split() if s.isdigit()]
-                        if numbers:
-                            numeric_exp.append(numbers[0])
-                    except:
-                        pass
+                # Extract numeric years from experience strings like "5 years"
+                numeric_exp = pd.to_numeric(exp_data.astype(str).str.extract(r'(\d+)', expand=False),
+                                            errors='coerce').dropna()
                 
-                if numeric_exp:
-                    avg_exp = np.mean(numeric_exp)
+                if not numeric_exp.empty:
+                    avg_exp = numeric_exp.mean()
                     insights.append(f"Average years of experience: {avg_exp:.1f} years")
         
         # Email domain analysis
         if 'email' in self.data.columns:
-            emails = self.data[self.data['email'] != 'Not Found']['email']
+            emails = self.data['email'][self._found['email']]
             if not emails.empty:
-                domains = [email.split('@')[1] if '@' in str(email) else 'unknown' for email in emails]
-                domain_counts = pd.Series(domains).value_counts()
+                domains = emails.astype(str).str.split('@').str[1].fillna('unknown')
+                domain_counts = domains.value_counts()
                 insights.append(f"Most common email domain: {domain_counts.index[0]} ({domain_counts.iloc[0]} users)")
         
         # Customer satisfaction analysis (if survey data)
         if 'rating' in self.data.columns:
-            ratings = self.data[self.data['rating'] != 'Not Found']['rating']
+            ratings = self.data['rating'][self._found['rating']]
             if not ratings.empty:
-                # Extract numeric ratings
-                numeric_ratings = []
-                for rating in ratings:
-                    try:
-                        # Extract numbers from strings like "4/5" or "4"
-                        if '/' in str(rating):
-                            numeric_ratings.append(int(str(rating).split('/')[0]))
-                        else:
-                            numeric_ratings.append(int(str(rating)))
-                    except:
-                        pass
+                # Extract numeric ratings from strings like "4/5" or "4"
+                numeric_ratings = pd.to_numeric(ratings.astype(str).str.extract(r'(\d+)', expand=False),
+                                                errors='coerce').dropna()
                 
-                if numeric_ratings:
-                    avg_rating = np.mean(numeric_ratings)
+                if not numeric_ratings.empty:
+                    avg_rating = numeric_ratings.mean()
                     insights.append(f"Average satisfaction rating: {avg_rating:.1f}/5")
         
         # Display insights
@@ -225,67 +240,49 @@ class DataAnalyzer:
     
     def create_summary_dashboard(self, quality_df):
         """Create a comprehensive summary dashboard"""
-        fig = plt.figure(figsize=(16, 10))
-        gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
+        self.create_charts_only(quality_df)
+        self.create_text_report(quality_df)
+    
+    def create_charts_only(self, quality_df):
+        """Create the chart panels of the summary dashboard"""
+        import matplotlib.pyplot as plt
+        
+        self.setup_style()
+        fig = plt.figure(figsize=(12, 10))
+        gs = fig.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
         
         # Main title
         fig.suptitle('PDF-to-Spreadsheet Converter: Performance Dashboard', 
                     fontsize=18, fontweight='bold')
         
-        # 1. Key Metrics (Top row, spanning 2 columns)
-        ax1 = fig.add_subplot(gs[0, :2])
-        
-        metrics = {
-            'Total PDFs Processed': len(self.data),
-            'Total Fields Extracted': len([col for col in self.data.columns if col not in ['source_file', 'processed_date']]),
-            'Average Success Rate': f"{quality_df['Success_Rate'].mean():.1f}%",
-            'Data Points Captured': len(self.data) * len(quality_df),
-            'Processing Time': '< 30 seconds',
-            'Accuracy Rate': '95%+'
-        }
-        
-        # Create metrics display
-        ax1.axis('off')
-        metric_text = ""
-        for i, (key, value) in enumerate(metrics.items()):
-            if i % 2 == 0:
-                metric_text += f"📊 {key}: {value}\n"
-            else:
-                metric_text += f"⚡ {key}: {value}\n"
-        
-        ax1.text(0.5, 0.5, metric_text, transform=ax1.transAxes, fontsize=12,
-                verticalalignment='center', horizontalalignment='center',
-                bbox=dict(boxstyle="round,pad=0.5", facecolor='lightblue', alpha=0.8))
-        ax1.set_title('Key Performance Metrics', fontweight='bold', fontsize=14)
-        
-        # 2. Success Rate Chart (Top right)
-        ax2 = fig.add_subplot(gs[0, 2])
+        # 1. Success Rate Chart (Top left)
+        ax1 = fig.add_subplot(gs[0, 0])
         success_rates = quality_df['Success_Rate']
         colors = ['#FF6B6B' if x < 50 else '#FFEAA7' if x < 80 else '#96CEB4' for x in success_rates]
-        bars = ax2.bar(range(len(success_rates)), success_rates, color=colors)
-        ax2.set_title('Field Success Rates', fontweight='bold')
-        ax2.set_ylabel('Success %')
-        ax2.set_xticks([])
-        ax2.grid(axis='y', alpha=0.3)
+        bars = ax1.bar(range(len(success_rates)), success_rates, color=colors)
+        ax1.set_title('Field Success Rates', fontweight='bold')
+        ax1.set_ylabel('Success %')
+        ax1.set_xticks([])
+        ax1.grid(axis='y', alpha=0.3)
         
-        # 3. Top Performing Fields (Middle left)
-        ax3 = fig.add_subplot(gs[1, 0])
+        # 2. Top Performing Fields (Top right)
+        ax2 = fig.add_subplot(gs[0, 1])
         top_fields = quality_df.head(6)
         y_pos = np.arange(len(top_fields))
-        bars = ax3.barh(y_pos, top_fields['Success_Rate'], color=self.colors[:len(top_fields)])
-        ax3.set_yticks(y_pos)
-        ax3.set_yticklabels([field.replace('_', ' ').title() for field in top_fields['Field']])
-        ax3.set_xlabel('Success Rate (%)')
-        ax3.set_title('Top Performing Fields', fontweight='bold')
+        bars = ax2.barh(y_pos, top_fields['Success_Rate'], color=self.colors[:len(top_fields)])
+        ax2.set_yticks(y_pos)
+        ax2.set_yticklabels([field.replace('_', ' ').title() for field in top_fields['Field']])
+        ax2.set_xlabel('Success Rate (%)')
+        ax2.set_title('Top Performing Fields', fontweight='bold')
         
         # Add value labels
         for i, (bar, rate) in enumerate(zip(bars, top_fields['Success_Rate'])):
             width = bar.get_width()
-            ax3.annotate(f'{rate:.1f}%', xy=(width, bar.get_y() + bar.get_height()/2),
+            ax2.annotate(f'{rate:.1f}%', xy=(width, bar.get_y() + bar.get_height()/2),
                         xytext=(3, 0), textcoords='offset points', va='center')
         
-        # 4. Data Quality Distribution (Middle center)
-        ax4 = fig.add_subplot(gs[1, 1])
+        # 3. Data Quality Distribution (Bottom left)
+        ax3 = fig.add_subplot(gs[1, 0])
         quality_ranges = ['90-100%', '80-90%', '70-80%', '60-70%', '<60%']
         counts = [
             len(quality_df[quality_df['Success_Rate'] >= 90]),
@@ -295,71 +292,92 @@ class DataAnalyzer:
             len(quality_df[quality_df['Success_Rate'] < 60])
         ]
         
-        wedges, texts, autotexts = ax4.pie(counts, labels=quality_ranges, autopct='%1.0f%%', 
+        wedges, texts, autotexts = ax3.pie(counts, labels=quality_ranges, autopct='%1.0f%%', 
                                           colors=self.colors[:len(counts)])
-        ax4.set_title('Quality Distribution', fontweight='bold')
+        ax3.set_title('Quality Distribution', fontweight='bold')
         
-        # 5. Processing Timeline (Middle right)
-        ax5 = fig.add_subplot(gs[1, 2])
+        # 4. Processing Timeline (Bottom right)
+        ax4 = fig.add_subplot(gs[1, 1])
         # Create a mock timeline
         steps = ['PDF Input', 'Text Extract', 'Pattern Match', 'Data Clean', 'Excel Export']
         times = [2, 8, 12, 5, 3]  # Mock processing times in seconds
         
-        bars = ax5.bar(steps, times, color=self.colors[:len(steps)])
-        ax5.set_title('Processing Timeline', fontweight='bold')
-        ax5.set_ylabel('Time (seconds)')
-        ax5.tick_params(axis='x', rotation=45)
-        
-        # 6. Technology Stack (Bottom left)
-        ax6 = fig.add_subplot(gs[2, 0])
-        ax6.axis('off')
-        tech_text = """🛠️ Technology Stack:
-• Python 3.8+ (Core)
-• pdfplumber (Extraction)  
-• pandas (Data Processing)
-• openpyxl (Excel Export)
-• matplotlib (Visualization)
-• faker (Sample Data)"""
-        
-        ax6.text(0.05, 0.95, tech_text, transform=ax6.transAxes, fontsize=10,
-                verticalalignment='top', horizontalalignment='left',
-                bbox=dict(boxstyle="round,pad=0.3", facecolor='lightgreen', alpha=0.7))
-        
-        # 7. Business Impact (Bottom center)
-        ax7 = fig.add_subplot(gs[2, 1])
-        ax7.axis('off')
-        impact_text = """💼 Business Impact:
-• 80% reduction in processing time
-• 95%+ accuracy vs manual entry
-• Processes 100+ forms/hour
-• Eliminates data entry errors
-• Standardized output format
-• Scalable automation solution"""
-        
-        ax7.text(0.05, 0.95, impact_text, transform=ax7.transAxes, fontsize=10,
-                verticalalignment='top', horizontalalignment='left',
-                bbox=dict(boxstyle="round,pad=0.3", facecolor='lightyellow', alpha=0.7))
-        
-        # 8. Next Steps (Bottom right)
-        ax8 = fig.add_subplot(gs[2, 2])
-        ax8.axis('off')
-        next_text = """🚀 Next Steps:
-• Add OCR for scanned PDFs
-• Build GUI interface
-• Integrate with databases
-• Add machine learning
-• Create REST API
-• Deploy to cloud"""
-        
-        ax8.text(0.05, 0.95, next_text, transform=ax8.transAxes, fontsize=10,
-                verticalalignment='top', horizontalalignment='left',
-                bbox=dict(boxstyle="round,pad=0.3", facecolor='lightcoral', alpha=0.7))
+        bars = ax4.bar(steps, times, color=self.colors[:len(steps)])
+        ax4.set_title('Processing Timeline', fontweight='bold')
+        ax4.set_ylabel('Time (seconds)')
+        ax4.tick_params(axis='x', rotation=45)
         
         # Save dashboard
-        plt.savefig('screenshots/performance_dashboard.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig('screenshots/performance_dashboard.png', dpi=150, bbox_inches='tight')
+        self._show_and_close(fig)
         
         print("✅ Performance dashboard saved to screenshots/performance_dashboard.png")
+    
+    def create_text_report(self, quality_df):
+        """Write the dashboard's metrics and notes as a static HTML report"""
+        metrics = {
+            'Total PDFs Processed': len(self.data),
+            'Total Fields Extracted': len([col for col in self.data.columns if col not in ['source_file', 'processed_date']]),
+            'Average Success Rate': f"{quality_df['Success_Rate'].mean():.1f}%",
+            'Data Points Captured': len(self.data) * len(quality_df),
+            'Processing Time': '< 30 seconds',
+            'Accuracy Rate': '95%+'
+        }
+        
+        sections = {
+            '🛠️ Technology Stack': [
+                'Python 3.8+ (Core)',
+                'pdfplumber (Extraction)',
+                'pandas (Data Processing)',
+                'openpyxl (Excel Export)',
+                'matplotlib (Visualization)',
+                'faker (Sample Data)'
+            ],
+            '💼 Business Impact': [
+                '80% reduction in processing time',
+                '95%+ accuracy vs manual entry',
+                'Processes 100+ forms/hour',
+                'Eliminates data entry errors',
+                'Standardized output format',
+                'Scalable automation solution'
+            ],
+            '🚀 Next Steps': [
+                'Add OCR for scanned PDFs',
+                'Build GUI interface',
+                'Integrate with databases',
+                'Add machine learning',
+                'Create REST API',
+                'Deploy to cloud'
+            ]
+        }
+        
+        lines = [
+            '<!DOCTYPE html>',
+            '<html><head><meta charset="utf-8">',
+            '<title>PDF-to-Spreadsheet Converter Report</title>',
+            '<style>body { font-family: sans-serif; margin: 2em; } '
+            'ul { line-height: 1.6; } h2 { border-bottom: 1px solid #ccc; }</style>',
+            '</head><body>',
+            '<h1>PDF-to-Spreadsheet Converter: Performance Report</h1>',
+            '<h2>📊 Key Performance Metrics</h2>',
+            '<ul>'
+        ]
+        lines.extend(f'<li><b>{html.escape(key)}:</b> {html.escape(str(value))}</li>'
+                     for key, value in metrics.items())
+        lines.append('</ul>')
+        
+        for title, items in sections.items():
+            lines.append(f'<h2>{html.escape(title)}</h2>')
+            lines.append('<ul>')
+            lines.extend(f'<li>{html.escape(item)}</li>' for item in items)
+            lines.append('</ul>')
+        
+        lines.append('</body></html>')
+        
+        Path('screenshots').mkdir(exist_ok=True)
+        Path('screenshots/report.html').write_text('\n'.join(lines), encoding='utf-8')
+        
+        print("✅ Text report saved to screenshots/report.html")
 
 def main():
     """Main analysis function"""
@@ -7,146 +7,250 @@ Extracts structured data from PDF forms and converts to Excel
 
 import os
 import re
+import sys
+import hashlib
+import importlib.util
 import pandas as pd
-import pdfplumber
 from pathlib import Path
 from datetime import datetime
+from dataclasses import make_dataclass
+from operator import attrgetter
+from concurrent.futures import ProcessPoolExecutor
+
+# Extracted text is cached here, keyed by a hash of the PDF contents
+CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / ".cache"
+
+# Field label patterns; alternatives are tried in order of preference
+EXTRACTION_PATTERNS = {
+    # Personal Information
+    'name': [
+        r'Name:\s*([^\n]+)',
+        r'Full Name:\s*([^\n]+)',
+        r'Applicant Name:\s*([^\n]+)'
+    ],
+    'email': [
+        r'Email(?:\s+Address)?:\s*([^\s\n]+@[^\s\n]+)',
+        r'E-mail:\s*([^\s\n]+@[^\s\n]+)'
+    ],
+    'phone': [
+        r'Phone(?:\s+Number)?:\s*([^\n]+)',
+        r'Telephone:\s*([^\n]+)',
+        r'Contact Number:\s*([^\n]+)'
+    ],
+    'address': [
+        r'Address:\s*([^\n]+(?:\n[^\n:]+)*?)(?=\n[A-Z][a-z]*:|$)',
+        r'Mailing Address:\s*([^\n]+)'
+    ],
+    'date_of_birth': [
+        r'Date of Birth:\s*([^\n]+)',
+        r'DOB:\s*([^\n]+)',
+        r'Birth Date:\s*([^\n]+)'
+    ],
+    'ssn': [
+        r'Social Security Number:\s*([^\n]+)',
+        r'SSN:\s*([^\n]+)'
+    ],
+    
+    # Position Information
+    'position': [
+        r'Position Applied For:\s*([^\n]+)',
+        r'Job Title:\s*([^\n]+)',
+        r'Position:\s*([^\n]+)'
+    ],
+    'salary': [
+        r'Desired Salary:\s*([^\n]+)',
+        r'Expected Salary:\s*([^\n]+)',
+        r'Salary Expectation:\s*([^\n]+)'
+    ],
+    'experience': [
+        r'Years of Experience:\s*([^\n]+)',
+        r'Experience:\s*([^\n]+)',
+        r'Work Experience:\s*([^\n]+)'
+    ],
+    'availability': [
+        r'Availability:\s*([^\n]+)',
+        r'Start Date:\s*([^\n]+)'
+    ],
+    'employment_type': [
+        r'Employment Type:\s*([^\n]+)',
+        r'Position Type:\s*([^\n]+)'
+    ],
+    
+    # Education
+    'degree': [
+        r'Highest Degree:\s*([^\n]+)',
+        r'Degree:\s*([^\n]+)',
+        r'Education Level:\s*([^\n]+)'
+    ],
+    'major': [
+        r'Major/Field of Study:\s*([^\n]+)',
+        r'Major:\s*([^\n]+)',
+        r'Field of Study:\s*([^\n]+)'
+    ],
+    'institution': [
+        r'Institution:\s*([^\n]+)',
+        r'University:\s*([^\n]+)',
+        r'School:\s*([^\n]+)'
+    ],
+    'graduation_year': [
+        r'Graduation Year:\s*([^\n]+)',
+        r'Grad Year:\s*([^\n]+)'
+    ],
+    'gpa': [
+        r'GPA:\s*([^\n]+)',
+        r'Grade Point Average:\s*([^\n]+)'
+    ],
+    
+    # Survey specific
+    'customer_name': [
+        r'Customer Name:\s*([^\n]+)'
+    ],
+    'purchase_date': [
+        r'Purchase Date:\s*([^\n]+)'
+    ],
+    'product': [
+        r'Product(?:\s+Purchased)?:\s*([^\n]+)'
+    ],
+    'rating': [
+        r'(?:Overall\s+)?(?:Satisfaction\s+)?Rating:\s*([^\n]+)',
+        r'Rate.*?:\s*([^\n]+)'
+    ],
+    'recommend': [
+        r'Would Recommend:\s*([^\n]+)',
+        r'Recommendation:\s*([^\n]+)'
+    ],
+    'customer_id': [
+        r'Customer ID:\s*([^\n]+)',
+        r'ID:\s*([^\n]+)'
+    ]
+}
+
+# Spreadsheet column order: key identifying fields first, then the rest
+PRIORITY_COLUMNS = [
+    'source_file', 'name', 'email', 'phone', 'position', 
+    'customer_name', 'product', 'rating', 'processed_date'
+]
+_METADATA_FIELDS = ('source_file', 'processed_date')
+RECORD_FIELDS = (
+    [col for col in PRIORITY_COLUMNS if col in EXTRACTION_PATTERNS or col in _METADATA_FIELDS]
+    + [field for field in EXTRACTION_PATTERNS if field not in PRIORITY_COLUMNS]
+)
+
+# One extracted PDF; the schema follows EXTRACTION_PATTERNS, so adding a
+# pattern adds a column. Slots (Python 3.10+) keep per-record overhead low.
+ExtractionRecord = make_dataclass(
+    'ExtractionRecord',
+    [(name, str, 'Not Found') for name in RECORD_FIELDS],
+    **({'slots': True} if sys.version_info >= (3, 10) else {})
+)
+ExtractionRecord.__module__ = __name__  # keep records picklable for process_many
+
+# Text extraction library for this process, chosen on first use
+_backend_name = None
+
+def _pdf_backend():
+    """Name of the text extraction library: PyMuPDF if installed, else pdfplumber"""
+    global _backend_name
+    if _backend_name is None:
+        # find_spec locates the module without paying for its import
+        _backend_name = 'pymupdf' if importlib.util.find_spec('pymupdf') is not None else 'pdfplumber'
+    return _backend_name
 
 class PDFConverter:
     def __init__(self):
+        # Compile patterns once so repeated extractions skip the re cache lookup
         self.extraction_patterns = {
-            # Personal Information
-            'name': [
-                r'Name:\s*([^\n]+)',
-                r'Full Name:\s*([^\n]+)',
-                r'Applicant Name:\s*([^\n]+)'
-            ],
-            'email': [
-                r'Email(?:\s+Address)?:\s*([^\s\n]+@[^\s\n]+)',
-                r'E-mail:\s*([^\s\n]+@[^\s\n]+)'
-            ],
-            'phone': [
-                r'Phone(?:\s+Number)?:\s*([^\n]+)',
-                r'Telephone:\s*([^\n]+)',
-                r'Contact Number:\s*([^\n]+)'
-            ],
-            'address': [
-                r'Address:\s*([^\n]+(?:\n[^\n:]+)*?)(?=\n[A-Z][a-z]*:|$)',
-                r'Mailing Address:\s*([^\n]+)'
-            ],
-            'date_of_birth': [
-                r'Date of Birth:\s*([^\n]+)',
-                r'DOB:\s*([^\n]+)',
-                r'Birth Date:\s*([^\n]+)'
-            ],
-            'ssn': [
-                r'Social Security Number:\s*([^\n]+)',
-                r'SSN:\s*([^\n]+)'
-            ],
-            
-            # Position Information
-            'position': [
-                r'Position Applied For:\s*([^\n]+)',
-                r'Job Title:\s*([^\n]+)',
-                r'Position:\s*([^\n]+)'
-            ],
-            'salary': [
-                r'Desired Salary:\s*([^\n]+)',
-                r'Expected Salary:\s*([^\n]+)',
-                r'Salary Expectation:\s*([^\n]+)'
-            ],
-            'experience': [
-                r'Years of Experience:\s*([^\n]+)',
-                r'Experience:\s*([^\n]+)',
-                r'Work Experience:\s*([^\n]+)'
-            ],
-            'availability': [
-                r'Availability:\s*([^\n]+)',
-                r'Start Date:\s*([^\n]+)'
-            ],
-            'employment_type': [
-                r'Employment Type:\s*([^\n]+)',
-                r'Position Type:\s*([^\n]+)'
-            ],
-            
-            # Education
-            'degree': [
-                r'Highest Degree:\s*([^\n]+)',
-                r'Degree:\s*([^\n]+)',
-                r'Education Level:\s*([^\n]+)'
-            ],
-            'major': [
-                r'Major/Field of Study:\s*([^\n]+)',
-                r'Major:\s*([^\n]+)',
-                r'Field of Study:\s*([^\n]+)'
-            ],
-            'institution': [
-                r'Institution:\s*([^\n]+)',
-                r'University:\s*([^\n]+)',
-                r'School:\s*([^\n]+)'
-            ],
-            'graduation_year': [
-                r'Graduation Year:\s*([^\n]+)',
-                r'Grad Year:\s*([^\n]+)'
-            ],
-            'gpa': [
-                r'GPA:\s*([^\n]+)',
-                r'Grade Point Average:\s*([^\n]+)'
-            ],
-            
-            # Survey specific
-            'customer_name': [
-                r'Customer Name:\s*([^\n]+)'
-            ],
-            'purchase_date': [
-                r'Purchase Date:\s*([^\n]+)'
-            ],
-            'product': [
-                r'Product(?:\s+Purchased)?:\s*([^\n]+)'
-            ],
-            'rating': [
-                r'(?:Overall\s+)?(?:Satisfaction\s+)?Rating:\s*([^\n]+)',
-                r'Rate.*?:\s*([^\n]+)'
-            ],
-            'recommend': [
-                r'Would Recommend:\s*([^\n]+)',
-                r'Recommendation:\s*([^\n]+)'
-            ],
-            'customer_id': [
-                r'Customer ID:\s*([^\n]+)',
-                r'ID:\s*([^\n]+)'
-            ]
+            field: [re.compile(p, re.IGNORECASE | re.MULTILINE) for p in patterns]
+            for field, patterns in EXTRACTION_PATTERNS.items()
         }
+        self._ws_re = re.compile(r'\s+')
     
     def extract_text_from_pdf(self, pdf_path):
-        """Extract all text from PDF file"""
+        """Extract all text from PDF file, reusing the on-disk cache when possible"""
+        try:
+            content_hash = hashlib.blake2b(Path(pdf_path).read_bytes(), digest_size=16)
+        except OSError as e:
+            print(f"Error extracting text from {pdf_path}: {e}")
+            return ""
+        
+        cache_path = self._cache_path(content_hash, _pdf_backend())
+        if cache_path.exists():
+            try:
+                return cache_path.read_text(encoding='utf-8')
+            except (OSError, UnicodeDecodeError):
+                # Unreadable or corrupt entry: drop it and parse the PDF again
+                try:
+                    cache_path.unlink()
+                except OSError:
+                    pass
+
+        text = self._parse_pdf_text(pdf_path)
+        if text.strip():
+            # Parsing may have fallen back to another backend; file it under that one
+            self._write_cache(self._cache_path(content_hash, _pdf_backend()), text)
+        return text
+    
+    def _cache_path(self, content_hash, backend):
+        """Cache file for a PDF's content hash as extracted by the given backend"""
+        # Different backends produce slightly different text, so key on both
+        hasher = content_hash.copy()
+        hasher.update(backend.encode())
+        return CACHE_DIR / f"{hasher.hexdigest()}.txt"
+    
+    def _parse_pdf_text(self, pdf_path):
+        """Parse text from a PDF file with the available backend"""
+        global _backend_name
         try:
+            if _pdf_backend() == 'pymupdf':
+                try:
+                    import pymupdf  # MuPDF-backed, much faster text extraction
+                except ImportError as e:
+                    # Installed but broken (e.g. an ABI mismatch): use pdfplumber from now on
+                    print(f"PyMuPDF failed to import ({e}); falling back to pdfplumber")
+                    _backend_name = 'pdfplumber'
+                else:
+                    with pymupdf.open(pdf_path) as doc:
+                        return "\n".join(page.get_text() for page in doc)
+            
+            import pdfplumber
             with pdfplumber.open(pdf_path) as pdf:
-                text = ""
+                # extract_text() returns None for blank pages
+                parts = []
                 for page in pdf.pages:
-                    text += page.extract_text() + "\n"
-                return text
+                    parts.append(page.extract_text() or '')
+                return "\n".join(parts)
         except Exception as e:
             print(f"Error extracting text from {pdf_path}: {e}")
             return ""
     
+    def _write_cache(self, cache_path, text):
+        """Atomically store extracted text; caching failures are not fatal"""
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(text, encoding='utf-8')
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+    
     def extract_data_from_text(self, text):
         """Extract structured data using regex patterns"""
-        extracted_data = {}
+        record = ExtractionRecord()
         
         for field, patterns in self.extraction_patterns.items():
             value = None
             
             for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+                match = pattern.search(text)
                 if match:
                     value = match.group(1).strip()
-                    value = re.sub(r'\s+', ' ', value)
+                    value = self._ws_re.sub(' ', value)
                     break
             
-            extracted_data[field] = value if value else "Not Found"
+            if value:
+                setattr(record, field, value)
         
-        return extracted_data
+        return record
     
     def process_single_pdf(self, pdf_path):
         """Process a single PDF file and extract data"""
@@ -156,56 +260,49 @@ class PDFConverter:
             print(f"No text extracted from {pdf_path}")
             return None
         
-        data = self.extract_data_from_text(text)
+        record = self.extract_data_from_text(text)
         
-        data['source_file'] = os.path.basename(pdf_path)
-        data['processed_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        record.source_file = os.path.basename(pdf_path)
+        record.processed_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-        return data
+        return record
+    
+    def process_many(self, pdf_paths, max_workers=None):
+        """Process several PDF files in parallel across worker processes"""
+        pdf_paths = [str(p) for p in pdf_paths]
+        
+        if len(pdf_paths) < 2:
+            rows = [self.process_single_pdf(p) for p in pdf_paths]
+        else:
+            workers = max_workers or os.cpu_count() or 1
+            chunksize = max(1, len(pdf_paths) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                rows = list(executor.map(self.process_single_pdf, pdf_paths, chunksize=chunksize))
+        
+        return [row for row in rows if row]
     
     def save_to_excel(self, data, output_file="extracted_data.xlsx"):
-        """Save extracted data to Excel file"""
+        """Save a list of ExtractionRecord objects to an Excel file"""
         if not data:
             return False
         
         try:
-            df = pd.DataFrame(data)
-            
-            priority_columns = [
-                'source_file', 'name', 'email', 'phone', 'position', 
-                'customer_name', 'product', 'rating', 'processed_date'
-            ]
-            
-            all_columns = list(df.columns)
-            ordered_columns = []
+            # Records already carry the final column order
+            get_values = attrgetter(*RECORD_FIELDS)
+            df = pd.DataFrame([get_values(record) for record in data], columns=RECORD_FIELDS)
             
-            for col in priority_columns:
-                if col in all_columns:
-                    ordered_columns.append(col)
-                    all_columns.remove(col)
+            # Column widths from header and cell text lengths, computed up front
+            cell_lengths = df.astype(str).apply(lambda col: col.str.len().max())
             
-            ordered_columns.extend(all_columns)
-            df = df[ordered_columns]
-            
-            with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+            with pd.ExcelWriter(output_file, engine='xlsxwriter') as writer:
                 df.to_excel(writer, sheet_name='Extracted_Data', index=False)
                 
-                workbook = writer.book
                 worksheet = writer.sheets['Extracted_Data']
                 
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    
+                for idx, column in enumerate(df.columns):
+                    max_length = max(cell_lengths[column], len(str(column)))
                     adjusted_width = min(max_length + 2, 50)
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
+                    worksheet.set_column(idx, idx, adjusted_width)
             
             return True
             
@@ -259,17 +356,37 @@ def main(selected_pdf_path=None):
         return
 
     # Interactive mode
-    pdf_files = [f for f in sorted(os.listdir(pdf_dir)) if f.lower().endswith('.pdf')]
+    with os.scandir(pdf_dir) as entries:
+        pdf_files = sorted((e for e in entries if e.name.lower().endswith('.pdf') and e.is_file()),
+                           key=lambda e: e.name)
     if not pdf_files:
         print(f"No PDF files found in '{pdf_dir}'")
         return
 
     print("\nAvailable PDF files:")
-    for idx, fname in enumerate(pdf_files, 1):
-        print(f"  {idx}. {fname}")
+    for idx, entry in enumerate(pdf_files, 1):
+        print(f"  {idx}. {entry.name}")
+
+    choice = input(f"\nSelect a PDF to convert (1-{len(pdf_files)}, or 'a' for all): ").strip()
+
+    if choice.lower() == 'a':
+        print(f"Processing {len(pdf_files)} PDF files...")
+        rows = converter.process_many(entry.path for entry in pdf_files)
+        if not rows:
+            print("Failed to extract data from PDFs")
+            return
+        output_file = output_dir / "extracted_pdf_data.xlsx"
+        success = converter.save_to_excel(rows, str(output_file))
+        if success:
+            print("\nConversion completed successfully!")
+            print(f"Output file: {output_file}")
+            print(f"Records extracted: {len(rows)}/{len(pdf_files)}")
+        else:
+            print("Failed to save Excel file")
+        return
 
     try:
-        choice = int(input(f"\nSelect a PDF to convert (1-{len(pdf_files)}): "))
+        choice = int(choice)
         if choice < 1 or choice > len(pdf_files):
             print("Invalid selection.")
             return
@@ -278,9 +395,9 @@ def main(selected_pdf_path=None):
         return
 
     selected_pdf = pdf_files[choice - 1]
-    pdf_path = pdf_dir / selected_pdf
+    pdf_path = Path(selected_pdf.path)
 
-    print(f"Processing: {selected_pdf}")
+    print(f"Processing: {selected_pdf.name}")
 
     data = converter.process_single_pdf(str(pdf_path))
     if not data:
@@ -299,7 +416,6 @@ def main(selected_pdf_path=None):
 
 # Replace the script entry point to accept an optional CLI argument
 if __name__ == "__main__":
-    import sys
     if len(sys.argv) > 1:
         main(sys.argv[1])
     else:
@@ -4,20 +4,33 @@ PDF-to-Spreadsheet Converter - Simple Project Runner
 
 import os
 import sys
-import subprocess
+import types
+import contextlib
+import threading
 from pathlib import Path
-import importlib
-import importlib.util
 
 # Determine project root (one level up from src/)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
-# Required packages (specs)
-PACKAGES = [
-    "pandas>=1.5.0",
-    "pdfplumber>=0.9.0",
-    "openpyxl>=3.1.0"
-]
+# Project paths used by the runner, built once
+DATA_DIR = PROJECT_ROOT / "data"
+DATA_INPUT = DATA_DIR / "input"
+DATA_OUTPUT = DATA_DIR / "output"
+CONVERTER_PATH = PROJECT_ROOT / "src" / "pdf_converter.py"
+# ".pdf" in every letter case, so the input scan can match names without lowercasing them
+PDF_SUFFIXES = (".pdf", ".pdF", ".pDf", ".pDF", ".Pdf", ".PdF", ".PDf", ".PDF")
+# Written once every required package is present, to skip the check next run
+SETUP_SENTINEL = PROJECT_ROOT / ".setup_ok"
+
+# Required packages as (import name, pip spec) pairs
+PACKAGES = (
+    ("pandas", "pandas>=1.5.0"),
+    ("pymupdf", "pymupdf>=1.24.3"),
+    ("pdfplumber", "pdfplumber>=0.9.0"),
+    ("openpyxl", "openpyxl>=3.1.0"),
+    ("xlsxwriter", "xlsxwriter>=3.0.0"),
+    ("python_calamine", "python-calamine>=0.2.0")
+)
 
 def check_python_version():
     """Check if Python version is compatible"""
@@ -28,147 +41,279 @@ def check_python_version():
     print(f"Python version: {version.major}.{version.minor}.{version.micro}")
     return True
 
-def install_package(package):
-    """Install a single package silently"""
+# Quiet, non-interactive install without pip's version-check request
+_PIP_INSTALL_ARGS = ["install", "--quiet", "--no-color", "--no-input",
+                     "--disable-pip-version-check", "--prefer-binary"]
+
+def _run_pip_in_process(args):
+    """Run pip inside this interpreter; None if pip's internals are unavailable"""
+    import logging
+    # pip installs root logger handlers bound to the redirected streams; put the
+    # old configuration back so later warnings don't hit a closed devnull
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    saved_disable = root.manager.disable
+    # pip does not officially support this, so any failure to load or run it
+    # sends the caller back to the subprocess path
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package], 
-                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        return True
-    except subprocess.CalledProcessError:
-        return False
+        from pip._internal.cli.main import main as pip_main
+        with open(os.devnull, "w") as devnull, \
+                contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            return pip_main(args) == 0
+    except (Exception, SystemExit):
+        return None
+    finally:
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+        logging.disable(saved_disable)
 
-def _base_name(spec: str) -> str:
-    return spec.split('>=')[0].strip()
+def install_packages(packages):
+    """Install several packages silently with a single pip invocation"""
+    args = [*_PIP_INSTALL_ARGS, *packages]
+    success = _run_pip_in_process(args)
+    if success is None:
+        # Imported here: only needed when something is actually missing
+        import subprocess
+        # pip's own modules need no bytecode for a one-off run
+        env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+        try:
+            subprocess.check_call([sys.executable, "-m", "pip", *args], 
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+            success = True
+        except subprocess.CalledProcessError:
+            success = False
+    if success:
+        # Let find_spec and imports see the newly installed packages
+        import importlib
+        importlib.invalidate_caches()
+    return success
+
+def install_package(package):
+    """Install a single package silently"""
+    return install_packages([package])
 
 def get_missing_packages(packages):
-    """Return list of package specs that are not importable in this env."""
+    """Return the (name, spec) pairs whose modules are not importable in this env."""
+    import importlib.util
     missing = []
-    for spec in packages:
-        name = _base_name(spec)
+    # Already-imported modules need no lookup; otherwise ask the finders,
+    # which locates a module without executing it
+    modules = sys.modules
+    for name, spec in packages:
+        if name in modules:
+            continue
         try:
-            importlib.import_module(name)
-        except Exception:
-            missing.append(spec)
+            found = importlib.util.find_spec(name) is not None
+        except (ValueError, ModuleNotFoundError):
+            # Raised for broken namespace packages or half-removed installs
+            found = False
+        if not found:
+            missing.append((name, spec))
     return missing
 
 def setup_environment(packages_to_install):
-    """Install only the packages in packages_to_install (list of specs).
+    """Install only the packages in packages_to_install (list of (name, spec) pairs).
     If the list is empty, nothing is installed.
     """
     if not packages_to_install:
         print("All required packages are already installed.")
         return True
     print("Installing required packages...")
-    failed_packages = []
-    for spec in packages_to_install:
-        pkg_name = _base_name(spec)
-        print(f"Installing {pkg_name}...")
-        if not install_package(spec):
-            failed_packages.append(pkg_name)
-    if failed_packages:
-        print(f"Failed to install: {', '.join(failed_packages)}")
-        print("Please install manually using: pip install <package_name>")
-        return False
+    pkg_names = [name for name, _ in packages_to_install]
+    specs = [spec for _, spec in packages_to_install]
+    print(f"Installing {', '.join(pkg_names)}...")
+    # One pip run resolves and downloads everything together; separate pip
+    # processes in parallel would race on shared dependencies in site-packages
+    if not install_packages(specs):
+        # pip aborts the whole batch on one bad spec; retry individually to
+        # find out which packages actually failed
+        failed_packages = pkg_names
+        if len(packages_to_install) > 1:
+            failed_packages = [name for name, spec in packages_to_install
+                               if not install_package(spec)]
+        if failed_packages:
+            print(f"Failed to install: {', '.join(failed_packages)}")
+            print("Please install manually using: pip install <package_name>")
+            return False
     print("Packages installed successfully")
     return True
 
+def _setup_fingerprint():
+    """Identify the interpreter and package list a completed setup applies to"""
+    return "|".join([sys.executable, sys.version, *(spec for _, spec in PACKAGES)])
+
+def _setup_already_done():
+    """True if the sentinel records a completed setup for this exact environment"""
+    try:
+        return SETUP_SENTINEL.read_text(encoding="utf-8") == _setup_fingerprint()
+    except OSError:
+        return False
+
+def _mark_setup_done():
+    """Record a completed setup; failing to write it only costs a re-check"""
+    try:
+        SETUP_SENTINEL.write_text(_setup_fingerprint(), encoding="utf-8")
+    except OSError:
+        pass
+
 def create_directories():
     """Create necessary project directories"""
-    directories = [
-        PROJECT_ROOT / "data" / "input",
-        PROJECT_ROOT / "data" / "output"
-    ]
-    for directory in directories:
-        Path(directory).mkdir(parents=True, exist_ok=True)
+    # Create the shared parent once so the leaves need no ancestor walk
+    DATA_DIR.mkdir(exist_ok=True)
+    DATA_INPUT.mkdir(exist_ok=True)
+    DATA_OUTPUT.mkdir(exist_ok=True)
+
+# Loaded converter modules keyed by path, with the source they were built from
+_CONVERTER_CACHE = {}
+
+def _compile_converter(converter_path, source):
+    """Compile the converter source, reusing a hash-checked .pyc from __pycache__"""
+    import importlib.util
+    import marshal
+    path_str = str(converter_path)
+    pyc_path = Path(importlib.util.cache_from_source(path_str))
+    # PEP 552 header: magic number, flags (hash-based, checked), source hash
+    header = importlib.util.MAGIC_NUMBER + (0b11).to_bytes(4, "little") + importlib.util.source_hash(source)
+    try:
+        data = pyc_path.read_bytes()
+        if data[:16] == header:
+            return marshal.loads(data[16:])
+    except (OSError, ValueError, EOFError, TypeError):
+        pass
+
+    code = compile(source, path_str, "exec")
+    if not sys.dont_write_bytecode:
+        tmp_path = pyc_path.with_name(f"{pyc_path.name}.{os.getpid()}.tmp")
+        try:
+            pyc_path.parent.mkdir(exist_ok=True)
+            tmp_path.write_bytes(header + marshal.dumps(code))
+            os.replace(tmp_path, pyc_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+    return code
+
+def _load_converter_module(converter_path, source):
+    """Execute the converter source as a module, reusing it while the source is unchanged"""
+    path_str = str(converter_path)
+    cached = _CONVERTER_CACHE.get(path_str)
+    if cached is not None and cached[0] == source:
+        return cached[1]
+
+    code = _compile_converter(converter_path, source)
+    module = types.ModuleType("pdf_converter_module")
+    module.__file__ = path_str
+    # Register before executing so the module can find itself (e.g. pickling)
+    sys.modules[module.__name__] = module
+    try:
+        exec(code, module.__dict__)
+    except BaseException:
+        sys.modules.pop(module.__name__, None)
+        raise
+    _CONVERTER_CACHE[path_str] = (source, module)
+    return module
+
+def _prewarm_imports():
+    """Import the converter's heavy dependencies; any failure resurfaces on real use"""
+    import importlib
+    # Each group lists alternatives; only the first importable one is loaded
+    for names in (("pandas",), ("xlsxwriter",), ("pymupdf", "pdfplumber")):
+        for name in names:
+            try:
+                importlib.import_module(name)
+                break
+            except Exception:
+                continue
 
 def run_converter():
     """Run the PDF converter: list PDFs in data/input, prompt for selection, and run converter."""
-    input_dir = PROJECT_ROOT / "data" / "input"
+    input_dir = DATA_INPUT
     if not input_dir.exists():
         print(f"Error: input directory '{input_dir}' not found")
         return False
-    pdf_files = [p for p in sorted(input_dir.iterdir()) if p.is_file() and p.suffix.lower() == ".pdf"]
+    # Cheap name check first so only PDF candidates reach is_file(), which
+    # DirEntry usually answers from the directory listing without a stat.
+    # Path objects are only built for the entries that are kept.
+    pdf_paths = []
+    with os.scandir(input_dir) as entries:
+        for e in entries:
+            if e.name.endswith(PDF_SUFFIXES) and e.is_file():
+                pdf_paths.append(e.path)
+    pdf_paths.sort()
+    pdf_files = [Path(p) for p in pdf_paths]
     if not pdf_files:
         print(f"No PDF files found in '{input_dir}'")
         return True
 
-    print("\n🚀 PDF-to-Spreadsheet Converter")
-    print("Available PDF files:")
-    for idx, p in enumerate(pdf_files, 1):
-        print(f"  [{idx}] {p.name}")
+    # Overlap the slow dependency imports with the user's think time
+    preload = threading.Thread(target=_prewarm_imports, daemon=True)
+    preload.start()
+
+    # Build the menu once and emit it with a single write
+    lines = ["\n🚀 PDF-to-Spreadsheet Converter", "Available PDF files:"]
+    lines.extend(f"  [{idx}] {p.name}" for idx, p in enumerate(pdf_files, 1))
+    sys.stdout.write("\n".join(lines) + "\n")
 
     while True:
         choice = input(f"Select a PDF to convert [1-{len(pdf_files)}]: ").strip()
         if not choice:
             print("❌ No input provided. Please enter a number.")
             continue
-        try:
-            idx = int(choice)
-            if not (1 <= idx <= len(pdf_files)):
-                print("❌ Invalid selection. Try again.")
-                continue
-        except ValueError:
+        if not choice.isdecimal():
             print("❌ Invalid input. Please enter a number.")
             continue
-        selected = pdf_files[idx - 1]
-        break
+        idx = int(choice)
+        if 1 <= idx <= len(pdf_files):
+            break
+        print("❌ Invalid selection. Try again.")
+    selected = pdf_files[idx - 1]
 
-    converter_path = PROJECT_ROOT / "src" / "pdf_converter.py"
-    if not converter_path.exists():
+    converter_path = CONVERTER_PATH
+    # Reading the source doubles as the existence check
+    try:
+        source = converter_path.read_bytes()
+    except FileNotFoundError:
         print(f"Error: converter script not found at {converter_path}")
         return False
+    except OSError as e:
+        print(f"Error invoking converter module: {e}")
+        return False
 
     print(f"🔍 Processing PDF: {selected.name}")
+    preload.join()  # usually finished long before the user picks a file
     # Attempt to load and call the converter module directly
     try:
-        spec = importlib.util.spec_from_file_location("pdf_converter_module", str(converter_path))
-        if spec is None or spec.loader is None:
-            raise RuntimeError("Failed to load converter module spec")
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-
-        # Prefer calling main with the selected file if available
-        if hasattr(module, "main"):
+        module = _load_converter_module(converter_path, source)
+
+        # Prefer main, then common alternative function names
+        for func_name in ("main", "convert_pdf", "convert_file", "process_pdf", "convert"):
+            func = getattr(module, func_name, None)
+            if func is None:
+                continue
             try:
-                module.main(str(selected))
-                return True
+                func(str(selected))
             except TypeError:
-                # main() may take no args; call without
-                module.main()
-                return True
-
-        # Common alternative function names
-        for func_name in ("convert_pdf", "convert_file", "process_pdf", "convert"):
-            if hasattr(module, func_name):
-                getattr(module, func_name)(str(selected))
-                return True
+                # entry point may take no args; call without
+                func()
+            return True
 
         # If there is a PDFConverter class, try to use it
-        if hasattr(module, "PDFConverter"):
+        converter_cls = getattr(module, "PDFConverter", None)
+        if converter_cls is not None:
             try:
-                conv = module.PDFConverter()
+                conv = converter_cls()
                 for meth in ("convert", "process", "run", "convert_file"):
-                    if hasattr(conv, meth):
-                        getattr(conv, meth)(str(selected))
+                    method = getattr(conv, meth, None)
+                    if method is not None:
+                        method(str(selected))
                         return True
             except Exception:
                 pass
 
-        # Fallback: run as subprocess
-        subprocess.run([sys.executable, str(converter_path), str(selected)], check=True, cwd=str(PROJECT_ROOT))
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error running converter as subprocess: {e}")
+        print(f"Error: no usable entry point found in {converter_path}")
         return False
     except Exception as e:
         print(f"Error invoking converter module: {e}")
-        # final fallback to subprocess
-        try:
-            subprocess.run([sys.executable, str(converter_path), str(selected)], check=True, cwd=str(PROJECT_ROOT))
-            return True
-        except Exception as e2:
-            print(f"Final fallback failed: {e2}")
-            return False
+        return False
 
 def main():
     print("PDF-to-Spreadsheet Converter Setup")
@@ -179,11 +324,14 @@ def main():
     
     create_directories()
     
-    # Install only missing packages
-    missing = get_missing_packages(PACKAGES)
+    # Install only missing packages, unless a previous run already verified them
+    setup_done = _setup_already_done()
+    missing = [] if setup_done else get_missing_packages(PACKAGES)
     if not setup_environment(missing):
         print("Setup failed. Please install dependencies manually.")
         sys.exit(1)
+    if not setup_done:
+        _mark_setup_done()
     
     print("\nRunning PDF converter...")
     if not run_converter():